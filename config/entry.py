@@ -1,3 +1,4 @@
+import sys
 from dataclasses import dataclass
 from typing import Self
 
@@ -67,9 +68,24 @@ class ConfigEntry(Serializable):
         Note: This is the type checked version of the argparse.Namespace, but only for
         the arguments defined in the dataclass.
 
+        When --config <file> is the only argument, the config is loaded directly from
+        the given file (any format supported by Serializable, e.g. YAML/JSON) without
+        constructing the parser at all, which skips the entire dataclass introspection.
+        Combining --config with other arguments is an error, as the parser does not
+        know the option and cannot merge the file with CLI overrides.
+
         Returns:
             cfg (Self): The parsed config (instance of the dataclass config)
         """
+        argv = sys.argv[1:]
+        if len(argv) == 1 and argv[0].startswith("--config="):
+            return cls.load(argv[0].split("=", maxsplit=1)[1])
+        if len(argv) == 2 and argv[0] == "--config":
+            return cls.load(argv[1])
         parser = cls.create_parser(dest="config")
+        if any(arg == "--config" or arg.startswith("--config=") for arg in argv):
+            # Give a clear error instead of the misleading "unrecognized arguments"
+            # message the parser would produce, since it does not know the option.
+            parser.error("--config cannot be combined with other arguments")
         cfg: Self = parser.parse_args().config
         return cfg
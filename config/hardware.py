@@ -52,6 +52,21 @@ class HardwareConfig:
             num_workers = mp.cpu_count() // num_processes
         return num_workers
 
+    def calculate_prefetch_factor(self) -> int | None:
+        """
+        Number of batches each data loading worker prepares in advance.
+
+        The default of the DataLoader (2) is too shallow when a single batch occupies
+        the GPU for a long time (e.g. generation) while the workers are CPU-bound on
+        image resizing and tokenisation, causing the GPU to wait on data. Scaling the
+        prefetch depth with the batch size keeps the queue filled.
+
+        Returns None when no workers are used, as prefetching only applies to workers.
+        """
+        if self.calculate_num_workers() == 0:
+            return None
+        return max(4, self.batch_size // 2)
+
     def has_persistent_workers(self) -> bool:
         num_workers = self.calculate_num_workers()
         return num_workers > 0 and not self.no_persistent_workers
@@ -11,7 +11,7 @@ from PIL import Image
 from torch.utils.data import Dataset
 from transformers import PreTrainedTokenizerBase
 
-from dataset.resize import ImageResizer
+from dataset.resize import ImageResizer, load_resized_image
 
 from .chat.messages import ChatMessage
 
@@ -122,8 +122,7 @@ class InstructSample:
         if image_path is None:
             messages.append(ChatMessage.from_inputs([question], role="user"))
         else:
-            image = Image.open(path.parent / image_path).convert("RGB")
-            image = resizer(image)
+            image = load_resized_image(path.parent / image_path, resizer=resizer)
             messages.append(ChatMessage.from_inputs([image, question], role="user"))
         answer = data.get("answer")
         assert answer is not None, f"Sample `{path}` does not contain `answer`"
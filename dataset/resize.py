@@ -1,4 +1,8 @@
+import hashlib
+import os
+import tempfile
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Literal
 
 from PIL import Image
@@ -69,3 +73,52 @@ class ImageResizer:
         if self.larger_side:
             return resize_larger_side(img, size=self.larger_side, when=self.when)
         return img
+
+
+def load_resized_image(
+    path: str | os.PathLike, resizer: ImageResizer = ImageResizer()
+) -> Image.Image:
+    """
+    Load an image as RGB and resize it, optionally through a filesystem cache.
+
+    When the environment variable VISION_FINETUNE_CACHE_DIR is set and the resizer is
+    configured to resize, the resized image is stored in that directory, keyed by the
+    source path, its modification time and the resizer settings. Subsequent epochs and
+    runs then load the (usually much smaller) resized image directly instead of
+    decoding and resizing the original every single time.
+
+    Args:
+        path (str | os.PathLike): Path of the image to load.
+        resizer (ImageResizer): Image resizer to apply to the image. The default is
+            a no-op.
+
+    Returns:
+        img (Image.Image): The (potentially resized) image.
+    """
+    path = Path(path)
+    cache_dir = os.environ.get("VISION_FINETUNE_CACHE_DIR")
+    if not cache_dir or resizer.larger_side is None:
+        return resizer(Image.open(path).convert("RGB"))
+    key = hashlib.sha256(
+        f"{path.resolve()}:{path.stat().st_mtime}:"
+        f"{resizer.larger_side}:{resizer.when}".encode()
+    ).hexdigest()
+    cache_path = Path(cache_dir) / "resized" / f"{key}.png"
+    if cache_path.exists():
+        return Image.open(cache_path).convert("RGB")
+    img = resizer(Image.open(path).convert("RGB"))
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file and rename it into place, so that concurrent
+        # processes (data loading workers of multiple ranks) never read a partially
+        # written image.
+        with tempfile.NamedTemporaryFile(
+            dir=cache_path.parent, suffix=".png", delete=False
+        ) as fd:
+            img.save(fd, format="PNG")
+        os.replace(fd.name, cache_path)
+    except OSError:
+        # A failure to write the cache (e.g. read-only or full disk) is not fatal, the
+        # resized image is simply returned without being cached.
+        pass
+    return img
@@ -1,5 +1,6 @@
 import os
 from contextlib import contextmanager
+from typing import Any
 
 import torch
 import torch.distributed as dist
@@ -7,21 +8,59 @@ import torch.distributed as dist
 from utils import nested_dict
 from utils.nested_dict import NestedDict
 
+# Cache for the flattened key structure of synchronised dictionaries. In a training
+# loop the same dictionary structure is synchronised over and over (e.g. the metrics at
+# every epoch), so the sorting and splitting of the nested keys only needs to happen
+# once per structure.
+_schema_cache: dict[tuple[str, ...], list[list[str]]] = {}
+
+
+def _dict_schema(d: NestedDict[float]) -> list[list[str]]:
+    """
+    Get the schema of a nested dictionary, i.e. the sorted and pre-split nested keys.
+
+    Args:
+        d (NestedDict[float]): Dictionary whose schema should be determined.
+
+    Returns:
+        schema (list[list[str]]): Split path of every leaf key, sorted by the full key
+            to guarantee the same order across all processes.
+    """
+    signature = tuple(nested_dict.nested_keys(d, keep_none=False))
+    schema = _schema_cache.get(signature)
+    if schema is None:
+        schema = [key.split(".") for key in sorted(signature)]
+        _schema_cache[signature] = schema
+    return schema
+
+
+# Cached distributed state as (is_dist, world_size, rank). These values never change
+# once the process group has been initialised, but they are queried on every sync and
+# barrier, so the availability checks are only paid once.
+_STATE: tuple[bool, int, int] | None = None
+
+
+def _state() -> tuple[bool, int, int]:
+    global _STATE
+    if _STATE is None:
+        if not (dist.is_available() and dist.is_initialized()):
+            # Before the initialisation the defaults are returned without caching them,
+            # so that the cache can never lock in a pre-initialisation state.
+            return (False, 1, 0)
+        _STATE = (True, dist.get_world_size(), dist.get_rank())
+    return _STATE
+
 
 def is_dist() -> bool:
-    return dist.is_available() and dist.is_initialized()
+    return _state()[0]
 
 
 def world_size() -> int:
-    if not is_dist():
-        return 1
-    return dist.get_world_size()
+    return _state()[1]
 
 
 def rank() -> int:
-    if not is_dist():
-        return 0
-    return dist.get_rank()
+    return _state()[2]
 
 
 def is_main() -> bool:
@@ -63,6 +102,10 @@ def init(
     device_id = rank if device_ids is None else device_ids[rank]
     torch.cuda.set_device(device_id)
 
+    # Invalidate the cached state in case the process group was re-initialised.
+    global _STATE
+    _STATE = None
+
     return device_id
 
 
@@ -84,15 +127,28 @@ def sync_tensor(tensor: torch.Tensor, reduction: str | None = "mean") -> torch.T
     num_procs = world_size()
     if num_procs == 1:
         return tensor
-    gathered = [torch.zeros_like(tensor) for _ in range(num_procs)]
-    dist.all_gather(gathered, tensor)
-    gathered_stack = torch.stack(gathered, dim=0)
-    if reduction == "mean":
-        return torch.mean(gathered_stack, dim=0)
-    elif reduction == "sum":
-        return torch.sum(gathered_stack, dim=0)
+    if reduction == "mean" or reduction == "sum":
+        # A single all_reduce is much cheaper than gathering all values and reducing
+        # them manually, as it moves the size of the tensor per process (regardless of
+        # the number of processes) and never materialises the gathered tensors.
+        out = tensor.clone()
+        dist.all_reduce(out, op=dist.ReduceOp.SUM)
+        if reduction == "mean":
+            out = out / num_procs
+        return out
     elif reduction == "none" or reduction is None:
-        return gathered_stack
+        if hasattr(dist, "all_gather_into_tensor"):
+            # Gather directly into a single pre-allocated tensor, which avoids
+            # allocating one tensor per process and the copy of stacking them.
+            out = torch.empty(
+                (num_procs, *tensor.shape), dtype=tensor.dtype, device=tensor.device
+            )
+            dist.all_gather_into_tensor(out, tensor.contiguous())
+            return out
+        # Fallback for older PyTorch versions without all_gather_into_tensor.
+        gathered = [torch.zeros_like(tensor) for _ in range(num_procs)]
+        dist.all_gather(gathered, tensor)
+        return torch.stack(gathered, dim=0)
     else:
         raise ValueError(
             f"reduction={repr(reduction)} is not supported, "
@@ -100,6 +156,25 @@ def sync_tensor(tensor: torch.Tensor, reduction: str | None = "mean") -> torch.T
         )
 
 
+# Persistent staging buffers (pinned host tensor + device tensor) for sync_values,
+# keyed by device and number of values. Synchronising the same number of values
+# repeatedly (every logging step) then reuses the buffers instead of paying for
+# a fresh CUDA allocation and a synchronous host to device copy on every call.
+_staging_buffers: dict[tuple[torch.device, int], tuple[torch.Tensor, torch.Tensor]] = {}
+
+
+def _staging_tensors(n: int, device: torch.device) -> tuple[torch.Tensor, torch.Tensor]:
+    key = (device, n)
+    buffers = _staging_buffers.get(key)
+    if buffers is None:
+        buffers = (
+            torch.empty(n, dtype=torch.float, pin_memory=True),
+            torch.empty(n, dtype=torch.float, device=device),
+        )
+        _staging_buffers[key] = buffers
+    return buffers
+
+
 def sync_values(
     values: list[float], device: torch.device, reduction: str | None = "mean"
 ) -> list[float]:
@@ -119,7 +194,15 @@ def sync_values(
     """
     if world_size() == 1:
         return values
-    values_tensor = torch.tensor(values, dtype=torch.float, device=device)
+    device = torch.device(device)
+    if device.type == "cuda":
+        pinned, values_tensor = _staging_tensors(len(values), device)
+        pinned.copy_(torch.as_tensor(values, dtype=torch.float))
+        # From pinned memory the host to device copy is asynchronous, so it does not
+        # stall the CPU until the collective actually needs the data.
+        values_tensor.copy_(pinned, non_blocking=True)
+    else:
+        values_tensor = torch.tensor(values, dtype=torch.float, device=device)
     return sync_tensor(values_tensor, reduction=reduction).tolist()
 
 
@@ -130,6 +213,8 @@ def sync_dict_values(
     Synchronises a (nested) dictionary with simple values (numbers) across all
     processes.
 
+    Note: The dictionary is updated in place and returned for convenience.
+
     Args:
         d (NestedDict[float]): Dictionary to be synchronised. It can be nested as long as
             all leaf values can be stored in a tensor.
@@ -144,14 +229,77 @@ def sync_dict_values(
     """
     if world_size() == 1:
         return d
-    # Sort the keys in case the insertion order was different across the processes.
-    keys = sorted(nested_dict.nested_keys(d, keep_none=False))
-    values: list = [nested_dict.get_recursive(d, k) for k in keys]
+    # The keys are sorted in case the insertion order was different across the
+    # processes. The schema caches the sorting and splitting of the keys, as the same
+    # dictionary structure is synchronised repeatedly during the training.
+    schema = _dict_schema(d)
+    values: list = []
+    for parts in schema:
+        value: Any = d
+        for part in parts:
+            value = value[part]
+        values.append(value)
+    values = sync_values(values, device=device, reduction=reduction)
+    # The synchronised values are written back in place, as rebuilding the nested
+    # structure on every call would just reallocate the identical tree. The dictionary
+    # is rank-local, so mutating it is safe.
+    for parts, v in zip(schema, values):
+        curr: Any = d
+        for part in parts[:-1]:
+            curr = curr[part]
+        curr[parts[-1]] = v
+    return d
+
+
+def sync_dict_values_many(
+    dicts: list[NestedDict[float]], device: torch.device, reduction: str | None = "mean"
+) -> list[NestedDict[float]]:
+    """
+    Synchronises multiple (nested) dictionaries with simple values (numbers) across all
+    processes with a single collective operation.
+
+    This is equivalent to calling sync_dict_values once per dictionary, but all values
+    are fused into a single tensor, so the fixed overhead of launching a collective
+    (kernel launch + rendezvous) is only paid once instead of once per dictionary.
+
+    Note: The dictionaries are updated in place and returned for convenience.
+
+    Args:
+        dicts (list[NestedDict[float]]): Dictionaries to be synchronised. They can be
+            nested as long as all leaf values can be stored in a tensor.
+        device (torch.device): Device on which the synchronised tensor should be placed.
+        reduction (str): How to combine the results. When the reduction is
+            "sum" or "mean" a single value will be created out of all the synchronised
+            values. If the reduction is "none", the values of all processes will be
+            given as a list.
+
+    Returns:
+        out (list[NestedDict[float]]): Synchronised dictionaries
+    """
+    if world_size() == 1:
+        return dicts
+    # The keys are sorted in case the insertion order was different across the
+    # processes, with the sorting and splitting cached per dictionary structure.
+    schemas = [_dict_schema(d) for d in dicts]
+    values: list = []
+    for d, schema in zip(dicts, schemas):
+        for parts in schema:
+            value: Any = d
+            for part in parts:
+                value = value[part]
+            values.append(value)
     values = sync_values(values, device=device, reduction=reduction)
-    out: NestedDict[float] = {}
-    for k, v in zip(keys, values):
-        nested_dict.set_recursive(out, k, v)
-    return out
+    # Just like in sync_dict_values, the values are written back in place instead of
+    # reallocating the identical nested structure.
+    start = 0
+    for d, schema in zip(dicts, schemas):
+        for parts, v in zip(schema, values[start : start + len(schema)]):
+            curr: Any = d
+            for part in parts[:-1]:
+                curr = curr[part]
+            curr[parts[-1]] = v
+        start += len(schema)
+    return dicts
 
 
 @contextmanager
@@ -193,15 +341,20 @@ def on_main_first(
             will just occupy extra memory for no reason. Rather strange, but that's just
             how it is, so better avoid this.
     """
-    # Every process except the main process waits here until the main process has
-    # finished the task.
-    if enabled and is_dist() and not is_main():
+    if not (enabled and is_dist()):
+        yield
+        return
+    main = is_main()
+    # The release barrier is a single rendezvous entered from two different places:
+    # every process except the main process waits here until the main process has
+    # finished the task and enters the same barrier after the yield.
+    if not main:
         dist.barrier(device_ids=device_ids)
     yield
-    # The main process has finished and the others will be released from the barrier,
-    # since all processes now triggered it.
-    if enabled and is_dist() and is_main():
+    if main:
         dist.barrier(device_ids=device_ids)
-    # Join them to ensure they finish at the same time.
-    if enabled and join and is_dist():
+    # Join them to ensure they finish at the same time. This has to be a separate
+    # barrier, because the other processes still execute the body after being released,
+    # so the release barrier alone cannot guarantee that everyone finished.
+    if join:
         dist.barrier(device_ids=device_ids)
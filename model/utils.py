@@ -1,7 +1,27 @@
+import copy
+
 import torch.nn as nn
 from transformers import PreTrainedTokenizerBase
 
 
+def clone_processor(processor: PreTrainedTokenizerBase) -> PreTrainedTokenizerBase:
+    """
+    Create a shallow clone of a processor whose tokeniser settings (e.g. padding side)
+    can be changed without affecting the original.
+
+    A deep copy would duplicate the entire tokeniser state (vocab, Rust backend, image
+    processor), which is slow and can cost hundreds of MB of RAM for large
+    vocabularies. A shallow copy of the processor and of its tokeniser is enough to set
+    simple attributes independently, since all the heavy state is only ever read.
+    """
+    clone = copy.copy(processor)
+    if hasattr(processor, "tokenizer") and isinstance(
+        processor.tokenizer, PreTrainedTokenizerBase
+    ):
+        clone.tokenizer = copy.copy(processor.tokenizer)
+    return clone
+
+
 def unwrap_tokeniser(processor: PreTrainedTokenizerBase) -> PreTrainedTokenizerBase:
     tokeniser = (
         # FIXME: Fix this type annotation for Image/Text processors.
@@ -1,20 +1,25 @@
 import os
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 
-import torch
-from progrich import ProgressBar
-from torch.utils.data import DataLoader
-from unsloth import FastModel
-
 from config.ocr import OcrConfig
-from dataset import InstructDataset
-from dataset.collate import InstructCollator
-from model.utils import unwrap_tokeniser
 
 
-@torch.inference_mode()
 def main():
     cfg = OcrConfig.parse_config()
+
+    # The heavy imports are deferred until the arguments have been parsed successfully,
+    # so that --help and argument errors do not have to pay for loading torch/unsloth
+    # (including their CUDA state), which takes multiple seconds.
+    import torch
+    from progrich import ProgressBar
+    from torch.utils.data import DataLoader
+    from unsloth import FastModel
+
+    from dataset import InstructDataset
+    from dataset.collate import InstructCollator
+    from model.utils import unwrap_tokeniser
+
     torch.manual_seed(cfg.hardware.seed)
 
     os.environ["TOKENIZERS_PARALLELISM"] = "false"
@@ -41,12 +46,18 @@ def main():
         image_resizer=cfg.image.create_resizer(),
     )
     collator = InstructCollator(processor=processor, include_answer=False)
+    pin_memory = not cfg.hardware.no_pin_memory and hardware_manager.is_cuda()
     data_loader = DataLoader(
         dataset,
         batch_size=cfg.hardware.batch_size,
         num_workers=cfg.hardware.calculate_num_workers(),
         shuffle=False,
-        pin_memory=not cfg.hardware.no_pin_memory and hardware_manager.is_cuda(),
+        pin_memory=pin_memory,
+        # Pin directly for the CUDA device instead of letting PyTorch probe for it.
+        pin_memory_device="cuda" if pin_memory else "",
+        # Queue up more batches per worker, so the GPU never waits on data while the
+        # generation of the previous batch is still running.
+        prefetch_factor=cfg.hardware.calculate_prefetch_factor(),
         collate_fn=collator,
     )
     model_path = Path(cfg.model)
@@ -54,11 +65,58 @@ def main():
     out_dir = cfg.out_dir / cp_name
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    with ProgressBar("Extracting Text (OCR)", total=len(dataset), persist=True) as pbar:
+    # Pre-computing the directory once avoids constructing a Path object per sample,
+    # and writing through a raw file descriptor skips the buffered text wrapper, which
+    # is pure overhead for a single write per file.
+    out_dir_str = os.fspath(out_dir)
+
+    def write_pred(pred: str, path: Path):
+        fd = os.open(
+            os.path.join(out_dir_str, path.stem + ".md"),
+            os.O_WRONLY | os.O_CREAT | os.O_TRUNC,
+            0o644,
+        )
+        try:
+            os.write(fd, pred.encode("utf-8"))
+        finally:
+            os.close(fd)
+
+    def decode_and_write(
+        outputs: torch.Tensor,
+        prompt_len: int,
+        paths: list[Path],
+        copied: torch.cuda.Event | None = None,
+    ):
+        if copied is not None:
+            # Wait until the device to host copy of the outputs has finished.
+            copied.synchronize()
+        # All prompts in the batch share the same length due to the left padding, so
+        # the prompts can be stripped with a single slice and the whole batch can be
+        # decoded in one call into the tokeniser instead of row by row.
+        preds = tokeniser.batch_decode(
+            outputs[:, prompt_len:], skip_special_tokens=True
+        )
+        for pred, path in zip(preds, paths):
+            write_pred(pred, path)
+
+    # The generated tokens are copied to the host on a dedicated stream, so that the
+    # decoding and writing of a batch can run in the background (in the thread pool)
+    # while the default stream already generates the next batch.
+    copy_stream = torch.cuda.Stream() if hardware_manager.is_cuda() else None
+    jobs: list[Future] = []
+    with (
+        torch.inference_mode(),
+        # Decode and write the outputs from background threads, so that the tokeniser
+        # work and disk I/O overlap with the generation of the next batch.
+        ThreadPoolExecutor(max_workers=4) as executor,
+        ProgressBar("Extracting Text (OCR)", total=len(dataset), persist=True) as pbar,
+    ):
         for batch in data_loader:
             # The last batch may not be a full batch
             curr_batch_size = batch.data["input_ids"].size(0)
-            inputs = batch.data.to(hardware_manager.device)
+            # With pinned memory the copy is asynchronous, so it can overlap with the
+            # remaining Python work before the data is actually needed.
+            inputs = batch.data.to(hardware_manager.device, non_blocking=True)
             with hardware_manager.autocast():
                 outputs = model.generate(
                     **inputs,
@@ -66,16 +124,40 @@ def main():
                     pad_token_id=tokeniser.pad_token_id,
                 )
 
-            preds = [
-                tokeniser.decode(out[input_ids.size(0) :], skip_special_tokens=True)
-                for input_ids, out in zip(inputs.input_ids, outputs)
-            ]
-            for pred, path in zip(preds, batch.info["path"]):
-                with open(
-                    out_dir / path.with_suffix(".md").name, "w", encoding="utf-8"
-                ) as fd:
-                    fd.write(pred)
+            prompt_len = inputs.input_ids.size(1)
+            if copy_stream is None:
+                jobs.append(
+                    executor.submit(
+                        decode_and_write, outputs, prompt_len, batch.info["path"]
+                    )
+                )
+            else:
+                copy_stream.wait_stream(torch.cuda.current_stream())
+                with torch.cuda.stream(copy_stream):
+                    # An asynchronous copy requires a pinned host tensor as the
+                    # destination, a plain .to("cpu") would synchronise.
+                    outputs_cpu = torch.empty_like(
+                        outputs, device="cpu", pin_memory=True
+                    )
+                    outputs_cpu.copy_(outputs, non_blocking=True)
+                # Make sure the allocator does not reuse the outputs while the copy on
+                # the side stream is still pending.
+                outputs.record_stream(copy_stream)
+                copied = torch.cuda.Event()
+                copied.record(copy_stream)
+                jobs.append(
+                    executor.submit(
+                        decode_and_write,
+                        outputs_cpu,
+                        prompt_len,
+                        batch.info["path"],
+                        copied,
+                    )
+                )
             pbar.advance(curr_batch_size)
+    # Surface any error that occurred while decoding/writing the outputs.
+    for job in jobs:
+        job.result()
 
 
 if __name__ == "__main__":
@@ -1,8 +1,15 @@
 from dataclasses import dataclass
+from pathlib import Path
 
+import pytest
 from PIL import Image
 
-from dataset.resize import ResizeWhen, resize_larger_side
+from dataset.resize import (
+    ImageResizer,
+    ResizeWhen,
+    load_resized_image,
+    resize_larger_side,
+)
 
 
 @dataclass
@@ -110,3 +117,26 @@ TEST_CASES = [
 def test_resize_larger_side():
     for test_case in TEST_CASES:
         test_case.assert_resize_larger_side()
+
+
+def test_load_resized_image(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.delenv("VISION_FINETUNE_CACHE_DIR", raising=False)
+    img_path = tmp_path / "img.png"
+    Image.new("RGB", size=(768, 1024)).save(img_path)
+    img = load_resized_image(img_path, resizer=ImageResizer(larger_side=512))
+    assert img.size == (384, 512)
+
+
+def test_load_resized_image_cached(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setenv("VISION_FINETUNE_CACHE_DIR", str(cache_dir))
+    img_path = tmp_path / "img.png"
+    Image.new("RGB", size=(768, 1024)).save(img_path)
+    resizer = ImageResizer(larger_side=512)
+    img = load_resized_image(img_path, resizer=resizer)
+    assert img.size == (384, 512)
+    cached_files = list((cache_dir / "resized").glob("*.png"))
+    assert len(cached_files) == 1
+    # The second load is served from the cache and gives the same result.
+    img_cached = load_resized_image(img_path, resizer=resizer)
+    assert img_cached.size == (384, 512)
@@ -1,12 +1,4 @@
-import copy
 import os
-from pathlib import Path
-
-from progrich import Manager
-
-from config.train import TrainConfig
-from model.loader import create_lora_model
-from model.utils import unwrap_tokeniser
 
 # ruff: noqa: E402 (Disable import at top lint, because of this workaround)
 # unsloth hardcodes "cuda:0" in an attempt to disallow multi-GPU as they want to
@@ -18,23 +10,33 @@ num_processes = int(os.environ.get("WORLD_SIZE", "1"))
 if num_processes > 1:
     os.environ["CUDA_VISIBLE_DEVICES"] = os.environ.get("LOCAL_RANK", "0")
 
+from pathlib import Path
 
-import torch
-import torch.distributed as dist
-import torch.optim as optim
-import wandb
-from rich.console import Console
-from torch.nn.parallel import DistributedDataParallel
-from torch.utils.data import DataLoader, DistributedSampler
-from wandb.sdk.wandb_run import Run as WandbRun
-
-from dataset import InstructDataset
-from dataset.collate import InstructCollator
-from trainer import GrpoTrainer, InstructTrainer
+from config.train import TrainConfig
 
 
 def main() -> None:
     cfg = TrainConfig.parse_config()
+
+    # The heavy imports are deferred until the arguments have been parsed successfully,
+    # so that --help and argument errors do not have to pay for loading
+    # torch/unsloth/wandb (including their CUDA state), which takes multiple seconds.
+    import torch
+    import torch.distributed as dist
+    import torch.optim as optim
+    import wandb
+    from progrich import Manager
+    from rich.console import Console
+    from torch.nn.parallel import DistributedDataParallel
+    from torch.utils.data import BatchSampler, DataLoader, DistributedSampler
+    from wandb.sdk.wandb_run import Run as WandbRun
+
+    from dataset import InstructDataset
+    from dataset.collate import InstructCollator
+    from model.loader import create_lora_model
+    from model.utils import clone_processor, unwrap_tokeniser
+    from trainer import GrpoTrainer, InstructTrainer
+
     torch.manual_seed(cfg.hardware.seed)
 
     os.environ["TOKENIZERS_PARALLELISM"] = "false"
@@ -75,7 +77,9 @@ def main() -> None:
         tokeniser.padding_side = "left"
         validation_processor = processor
     else:
-        validation_processor = copy.deepcopy(processor)
+        # A shallow clone is enough to flip the padding side, a deep copy would
+        # needlessly duplicate the full tokeniser state.
+        validation_processor = clone_processor(processor)
         validation_tokeniser = unwrap_tokeniser(validation_processor)
         validation_tokeniser.padding_side = "left"
 
@@ -96,23 +100,40 @@ def main() -> None:
         # responsens, otherwise the answer is already given in full.
         prefill=cfg.prefill if cfg.trainer == "grpo" else None,
     )
-    train_sampler = (
-        DistributedSampler(train_dataset, num_replicas=num_processes, shuffle=True)
-        if num_processes > 1
-        else None
-    )
+    if num_processes > 1:
+        train_sampler = DistributedSampler(
+            train_dataset,
+            num_replicas=num_processes,
+            shuffle=True,
+            # Dropping the last incomplete batch avoids padding the samples across the
+            # processes, which would create an uneven workload per epoch.
+            drop_last=True,
+        )
+        # Wrapping the sampler in a BatchSampler slices out whole batches of indices at
+        # once instead of drawing them one at a time in a Python loop.
+        # Note: This is mutually exclusive with the batch_size/shuffle arguments of the
+        # DataLoader, hence the kwargs are assembled conditionally.
+        train_batch_kwargs = dict(
+            batch_sampler=BatchSampler(
+                train_sampler, batch_size=cfg.hardware.batch_size, drop_last=True
+            )
+        )
+    else:
+        train_batch_kwargs = dict(batch_size=cfg.hardware.batch_size, shuffle=True)
+    pin_memory = not cfg.hardware.no_pin_memory and hardware_manager.is_cuda()
     train_data_loader = DataLoader(
         train_dataset,
-        batch_size=cfg.hardware.batch_size,
         num_workers=cfg.hardware.calculate_num_workers(),
-        # Only shuffle when not using a sampler
-        shuffle=train_sampler is None,
-        sampler=train_sampler,
-        pin_memory=not cfg.hardware.no_pin_memory and hardware_manager.is_cuda(),
+        pin_memory=pin_memory,
+        # Pin directly for the CUDA device instead of letting PyTorch probe for it.
+        pin_memory_device="cuda" if pin_memory else "",
+        # Queue up more batches per worker, so the GPU never waits on data.
+        prefetch_factor=cfg.hardware.calculate_prefetch_factor(),
         # Keep workers alive after the epoch ends to avoid re-initialising them.
         # NOTE: If RAM becomes an issue, set this to false.
         persistent_workers=cfg.hardware.has_persistent_workers(),
         collate_fn=train_collator,
+        **train_batch_kwargs,
     )
 
     validation_dataset = InstructDataset(
@@ -147,20 +168,35 @@ def main() -> None:
         num_workers=cfg.hardware.calculate_num_workers(),
         shuffle=False,
         sampler=validation_sampler,
-        pin_memory=not cfg.hardware.no_pin_memory and hardware_manager.is_cuda(),
+        pin_memory=pin_memory,
+        # Pin directly for the CUDA device instead of letting PyTorch probe for it.
+        pin_memory_device="cuda" if pin_memory else "",
+        # Queue up more batches per worker, so the GPU never waits on data.
+        prefetch_factor=cfg.hardware.calculate_prefetch_factor(),
         # Keep workers alive after the epoch ends to avoid re-initialising them.
         # NOTE: If RAM becomes an issue, set this to false.
         persistent_workers=cfg.hardware.has_persistent_workers(),
         collate_fn=validation_collator,
     )
 
-    optimiser = optim.AdamW(
-        model.parameters(),
+    # The list is materialised so the parameters are not consumed by a failed attempt
+    # to construct the optimiser.
+    params = list(model.parameters())
+    adam_kwargs = dict(
         lr=cfg.lr.peak_lr,
         betas=(0.9, cfg.optim.adam_beta2),
         eps=cfg.optim.adam_eps,
         weight_decay=cfg.optim.weight_decay,
     )
+    try:
+        # The fused implementation combines the updates of all parameters into a single
+        # kernel launch per group, which is a substantial win for LoRA training, where
+        # there are many tiny tensors and the launch overhead dominates the step.
+        optimiser = optim.AdamW(params, fused=hardware_manager.is_cuda(), **adam_kwargs)
+    except TypeError:
+        # Older PyTorch without the fused option, where foreach at least batches the
+        # update operations across the parameters.
+        optimiser = optim.AdamW(params, foreach=True, **adam_kwargs)
     lr_scheduler = cfg.lr.create_scheduler(
         optimiser,
         train_data_loader,
@@ -15,12 +15,12 @@ def set_sampler_epoch(data_loader: DataLoader, epoch: int) -> int:
         num_replicas (int): Number of replicas used by the sampler, or 1 if no sampler
             is available.
     """
-    sampler = (
-        data_loader.sampler
-        if isinstance(data_loader.sampler, DistributedSampler)
-        else None
-    )
-    if sampler:
+    sampler = data_loader.sampler
+    if not isinstance(sampler, DistributedSampler):
+        # When the DataLoader is created with a batch_sampler, the distributed sampler
+        # is wrapped inside of it rather than being set as the sampler itself.
+        sampler = getattr(data_loader.batch_sampler, "sampler", None)
+    if isinstance(sampler, DistributedSampler):
         sampler.set_epoch(epoch)
         return sampler.num_replicas
     else: